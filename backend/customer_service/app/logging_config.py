@@ -0,0 +1,17 @@
+# week05/backend/customer_service/app/logging_config.py
+
+import logging
+import sys
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    # basicConfig is a no-op once the root logger has handlers, so repeat calls are harmless.
+    logging.basicConfig(
+        level=level,
+        format=LOG_FORMAT,
+        handlers=[logging.StreamHandler(sys.stdout)],
+    )
+    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+    logging.getLogger("uvicorn.error").setLevel(logging.INFO)
@@ -1,31 +1,51 @@
+import asyncio
 import logging
 import os
-import sys
-import time
 from typing import List, Optional
 
-from fastapi import Depends, FastAPI, HTTPException, Query, Response, status
+import httpx
+from fastapi import FastAPI, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.exc import IntegrityError, OperationalError
-from sqlalchemy.orm import Session
-
-from .db import Base, engine, get_db
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam, delete, insert, select, text, update
+from sqlalchemy.exc import IntegrityError
+
+from .cache import cache_delete, cache_get, cache_set
+from .db import AsyncSessionLocal, engine
+from .logging_config import configure_logging
 from .models import Customer
 from .schemas import CustomerCreate, CustomerResponse, CustomerUpdate
+from .security import hash_password
 
 # --- Logging ---
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
-logging.getLogger("uvicorn.error").setLevel(logging.INFO)
+# Columns served by the read endpoints; selecting them directly skips ORM hydration.
+CUSTOMER_COLUMNS = (
+    Customer.customer_id,
+    Customer.email,
+    Customer.first_name,
+    Customer.last_name,
+    Customer.phone_number,
+    Customer.shipping_address,
+    Customer.created_at,
+    Customer.updated_at,
+)
+
+# Built once so every lookup reuses the same compiled SQL and prepared statement.
+GET_CUSTOMER_STMT = select(*CUSTOMER_COLUMNS).where(Customer.customer_id == bindparam("customer_id"))
+
+# Built once at import; list endpoints validate a page with it, then return dump_json() bytes as-is.
+CUSTOMER_LIST_ADAPTER = TypeAdapter(List[CustomerResponse])
+
+# Upper bound on rows accepted by a single bulk-create request.
+MAX_BULK_ITEMS = 1000
 
 PRODUCT_SERVICE_URL = os.getenv("PRODUCT_SERVICE_URL", "http://localhost:8000")
-logger.info(f"Customer Service configured to talk to Product Service at {PRODUCT_SERVICE_URL}")
+logger.info("Customer Service configured to talk to Product Service at %s", PRODUCT_SERVICE_URL)
 
 # --- FastAPI App ---
 app = FastAPI(
@@ -34,39 +54,71 @@ app = FastAPI(
     version="1.0.0",
 )
 
+# Browsers reject a wildcard origin on credentialed requests, so origins are listed explicitly.
+ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
+# Compress larger payloads (mainly list responses); level 5 trades a little ratio for CPU.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # --- Health ---
 @app.get("/health", status_code=status.HTTP_200_OK)
 async def health_check():
     return {"status": "ok", "service": "customer-service"}
 
-# --- Startup: Conditional DB init ---
-@app.on_event("startup")
-async def startup_event():
-    if os.getenv("DISABLE_DB", "false").lower() == "true":
-        logger.warning("Customer Service: Skipping DB initialization (DISABLE_DB=true).")
-        return
+# DISABLE_DB (the image default) skips the DB check; k8s sets it to "false".
+DB_CHECK_DISABLED = os.getenv("DISABLE_DB", "false").lower() == "true"
+READY_TIMEOUT_SECONDS = float(os.getenv("READY_TIMEOUT_SECONDS", "2"))
 
-    max_retries = 10
-    for i in range(max_retries):
+@app.get("/ready")
+async def readiness_check():
+    # Live SELECT 1 on every probe, so the pod drops out of rotation whenever the DB is unreachable.
+    if not DB_CHECK_DISABLED:
         try:
-            logger.info(f"Customer Service: Attempting DB init (attempt {i+1}/{max_retries})")
-            Base.metadata.create_all(bind=engine)
-            logger.info("Customer Service: DB initialized successfully.")
-            break
-        except OperationalError as e:
-            logger.warning(f"Customer Service: DB connection failed: {e}")
-            time.sleep(5)
+            async with asyncio.timeout(READY_TIMEOUT_SECONDS):
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
         except Exception as e:
-            logger.critical(f"Unexpected DB startup error: {e}", exc_info=True)
-            sys.exit(1)
+            logger.warning("Customer Service: readiness DB check failed: %r", e)
+            return JSONResponse(
+                {"status": "unavailable", "service": "customer-service"},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+    return {"status": "ready", "service": "customer-service"}
+
+# --- Startup: Product Service client (schema is managed by Alembic; /ready checks the DB) ---
+@app.on_event("startup")
+async def startup_event():
+    # One pooled client for the whole process so calls to the Product Service reuse connections.
+    app.state.http = httpx.AsyncClient(
+        base_url=PRODUCT_SERVICE_URL,
+        timeout=5.0,
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
+
+    if DB_CHECK_DISABLED:
+        logger.warning("Customer Service: Skipping DB readiness check (DISABLE_DB=true).")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    http = getattr(app.state, "http", None)
+    if http is not None:
+        await http.aclose()
+
+def get_http(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http
 
 # --- Root ---
 @app.get("/", status_code=status.HTTP_200_OK)
@@ -75,73 +127,118 @@ async def read_root():
 
 # --- CRUD Endpoints (unchanged) ---
 @app.post("/customers/", response_model=CustomerResponse, status_code=status.HTTP_201_CREATED)
-async def create_customer(customer: CustomerCreate, db: Session = Depends(get_db)):
-    db_customer = Customer(
-        email=customer.email,
-        password_hash=customer.password,
-        first_name=customer.first_name,
-        last_name=customer.last_name,
-        phone_number=customer.phone_number,
-        shipping_address=customer.shipping_address,
+async def create_customer(customer: CustomerCreate):
+    stmt = (
+        insert(Customer)
+        .values(
+            email=customer.email,
+            password_hash=await hash_password(customer.password),
+            first_name=customer.first_name,
+            last_name=customer.last_name,
+            phone_number=customer.phone_number,
+            shipping_address=customer.shipping_address,
+        )
+        .returning(Customer)
     )
-    try:
-        db.add(db_customer)
-        db.commit()
-        db.refresh(db_customer)
-        return db_customer
-    except IntegrityError:
-        db.rollback()
-        raise HTTPException(status_code=400, detail="Email already registered.")
-    except Exception:
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Could not create customer.")
-
-@app.get("/customers/", response_model=List[CustomerResponse])
-def list_customers(db: Session = Depends(get_db), skip: int = 0, limit: int = 100, search: Optional[str] = None):
-    query = db.query(Customer)
+    async with AsyncSessionLocal() as db:
+        try:
+            db_customer = (await db.execute(stmt)).scalar_one()
+            await db.commit()
+            return CustomerResponse.model_validate(db_customer)
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail="Email already registered.")
+        except Exception:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail="Could not create customer.")
+
+@app.post("/customers/bulk", response_model=List[int], status_code=status.HTTP_201_CREATED)
+async def create_customers_bulk(customers: List[CustomerCreate]):
+    if len(customers) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ITEMS} customers per request.")
+    if not customers:
+        return []
+    password_hashes = await asyncio.gather(
+        *(hash_password(customer.password) for customer in customers)
+    )
+    rows = [
+        {**customer.model_dump(exclude={"password"}), "password_hash": password_hash}
+        for customer, password_hash in zip(customers, password_hashes)
+    ]
+    stmt = insert(Customer).returning(Customer.customer_id, sort_by_parameter_order=True)
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await db.execute(stmt, rows)
+            customer_ids = result.scalars().all()
+            await db.commit()
+            return customer_ids
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail="One or more emails already registered.")
+        except Exception:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail="Could not create customers.")
+
+@app.get("/customers/", response_model=None, responses={200: {"model": List[CustomerResponse]}})
+async def list_customers(skip: int = 0, limit: int = 100, search: Optional[str] = None):
+    stmt = select(*CUSTOMER_COLUMNS)
     if search:
-        query = query.filter(
+        stmt = stmt.where(
             (Customer.first_name.ilike(f"%{search}%")) |
             (Customer.last_name.ilike(f"%{search}%")) |
             (Customer.email.ilike(f"%{search}%"))
         )
-    return query.offset(skip).limit(limit).all()
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(stmt.offset(skip).limit(limit))
+        rows = result.mappings().all()
+    customers = CUSTOMER_LIST_ADAPTER.validate_python(rows)
+    return Response(CUSTOMER_LIST_ADAPTER.dump_json(customers), media_type="application/json")
 
 @app.get("/customers/{customer_id}", response_model=CustomerResponse)
-def get_customer(customer_id: int, db: Session = Depends(get_db)):
-    customer = db.query(Customer).filter(Customer.customer_id == customer_id).first()
+async def get_customer(customer_id: int):
+    cache_key = f"customer:{customer_id}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return Response(cached, media_type="application/json")
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(GET_CUSTOMER_STMT, {"customer_id": customer_id})
+        customer = result.mappings().first()
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
-    return customer
+    payload = CustomerResponse.model_validate(customer).model_dump_json()
+    await cache_set(cache_key, payload)
+    return Response(payload, media_type="application/json")
 
 @app.put("/customers/{customer_id}", response_model=CustomerResponse)
-async def update_customer(customer_id: int, customer_data: CustomerUpdate, db: Session = Depends(get_db)):
-    db_customer = db.query(Customer).filter(Customer.customer_id == customer_id).first()
-    if not db_customer:
+async def update_customer(customer_id: int, customer_data: CustomerUpdate):
+    stmt = (
+        update(Customer)
+        .where(Customer.customer_id == customer_id)
+        .values(**customer_data.model_dump(exclude_unset=True))
+        .returning(Customer)
+    )
+    async with AsyncSessionLocal() as db:
+        try:
+            db_customer = (await db.execute(stmt)).scalar_one_or_none()
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail="Updated email already exists")
+        except Exception:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail="Could not update customer")
+        response = CustomerResponse.model_validate(db_customer) if db_customer else None
+    await cache_delete(f"customer:{customer_id}")
+    if response is None:
         raise HTTPException(status_code=404, detail="Customer not found")
-    update_data = customer_data.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_customer, key, value)
-    try:
-        db.commit()
-        db.refresh(db_customer)
-        return db_customer
-    except IntegrityError:
-        db.rollback()
-        raise HTTPException(status_code=400, detail="Updated email already exists")
-    except Exception:
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Could not update customer")
+    return response
 
 @app.delete("/customers/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_customer(customer_id: int, db: Session = Depends(get_db)):
-    customer = db.query(Customer).filter(Customer.customer_id == customer_id).first()
-    if not customer:
+async def delete_customer(customer_id: int):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(delete(Customer).where(Customer.customer_id == customer_id))
+        await db.commit()
+    await cache_delete(f"customer:{customer_id}")
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Customer not found")
-    try:
-        db.delete(customer)
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Could not delete customer")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
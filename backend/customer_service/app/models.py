@@ -1,6 +1,6 @@
 # week05/backend/customer_service/app/models.py
 
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import Column, DateTime, Index, Integer, String
 from sqlalchemy.sql import func  # For auto-populating timestamps
 
 from .db import Base
@@ -8,6 +8,16 @@ from .db import Base
 
 class Customer(Base):
     __tablename__ = "customers_week05"  # Name of the database table
+    # Trigram GIN indexes backing the ILIKE search in list_customers (pg_trgm, migration 0002)
+    __table_args__ = tuple(
+        Index(
+            f"ix_customers_week05_{column}_trgm",
+            column,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+        for column in ("first_name", "last_name", "email")
+    )
 
     customer_id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -0,0 +1,18 @@
+# week05/backend/customer_service/app/security.py
+
+import os
+
+import anyio
+from argon2 import PasswordHasher
+
+# Modest argon2id cost so hashing stays in the low tens of milliseconds per call.
+password_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=1)
+
+# Each hash holds 64 MiB while it runs; at most one per CPU runs at a time, on a
+# dedicated limiter so bulk signups cannot fill anyio's shared thread pool.
+hash_limiter = anyio.CapacityLimiter(os.cpu_count() or 1)
+
+
+async def hash_password(password: str) -> str:
+    # argon2 releases the GIL, so hashing in a worker thread keeps the event loop free.
+    return await anyio.to_thread.run_sync(password_hasher.hash, password, limiter=hash_limiter)
@@ -0,0 +1,50 @@
+"""create customers table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases initialised by the old create_all startup already have these tables;
+    # skip them so 'alembic upgrade head' also works there.
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("customers_week05"):
+        op.create_table(
+            "customers_week05",
+            sa.Column("customer_id", sa.Integer(), nullable=False),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("password_hash", sa.String(), nullable=False),
+            sa.Column("first_name", sa.String(), nullable=False),
+            sa.Column("last_name", sa.String(), nullable=False),
+            sa.Column("phone_number", sa.String(), nullable=True),
+            sa.Column("shipping_address", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("customer_id"),
+        )
+        op.create_index("ix_customers_week05_customer_id", "customers_week05", ["customer_id"])
+        op.create_index("ix_customers_week05_email", "customers_week05", ["email"], unique=True)
+        op.create_index("ix_customers_week05_phone_number", "customers_week05", ["phone_number"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_customers_week05_phone_number", table_name="customers_week05")
+    op.drop_index("ix_customers_week05_email", table_name="customers_week05")
+    op.drop_index("ix_customers_week05_customer_id", table_name="customers_week05")
+    op.drop_table("customers_week05")
@@ -0,0 +1,39 @@
+"""add trigram indexes for customer search
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = ("first_name", "last_name", "email")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GIN trigram indexes let the planner serve list_customers' ILIKE '%...%' filters.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in SEARCH_COLUMNS:
+        op.create_index(
+            f"ix_customers_week05_{column}_trgm",
+            "customers_week05",
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in reversed(SEARCH_COLUMNS):
+        op.drop_index(f"ix_customers_week05_{column}_trgm", table_name="customers_week05")
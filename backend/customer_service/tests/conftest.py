@@ -0,0 +1,31 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base
+from app.main import app
+
+
+@pytest.fixture
+def sqlite_client(monkeypatch):
+    """TestClient whose handlers use a fresh in-memory SQLite database; yields (client, engine)."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    monkeypatch.setattr("app.main.AsyncSessionLocal", session_factory)
+    yield TestClient(app), engine
+    asyncio.run(engine.dispose())
@@ -0,0 +1,29 @@
+import asyncio
+
+from sqlalchemy import select
+
+from app.models import Customer
+from app.security import password_hasher
+
+
+def test_passwords_are_stored_as_argon2_hashes(sqlite_client):
+    c, engine = sqlite_client
+    single = {"email": "ada@example.com", "first_name": "Ada", "last_name": "L", "password": "correct-horse"}
+    batch = [
+        {"email": f"user{i}@example.com", "first_name": "U", "last_name": str(i), "password": f"secret-pass-{i}"}
+        for i in range(3)
+    ]
+    assert c.post("/customers/", json=single).status_code == 201
+    assert c.post("/customers/bulk", json=batch).status_code == 201
+
+    async def stored_hashes():
+        async with engine.connect() as conn:
+            result = await conn.execute(select(Customer.email, Customer.password_hash))
+            return dict(result.all())
+
+    hashes = asyncio.run(stored_hashes())
+    for customer in [single, *batch]:
+        stored = hashes[customer["email"]]
+        assert stored != customer["password"]
+        assert stored.startswith("$argon2id$")
+        assert password_hasher.verify(stored, customer["password"])
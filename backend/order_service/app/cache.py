@@ -0,0 +1,43 @@
+# week05/backend/order_service/app/cache.py
+
+import logging
+import os
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "300"))
+
+# --- Redis Client Setup (caching is disabled when REDIS_URL is not set) ---
+redis_client = aioredis.from_url(REDIS_URL) if REDIS_URL else None
+
+
+async def cache_get(key: str):
+    if redis_client is None:
+        return None
+    try:
+        return await redis_client.get(key)
+    except RedisError as e:
+        logger.warning("Cache read failed for %s: %s", key, e)
+        return None
+
+
+async def cache_set(key: str, value: str | bytes):
+    if redis_client is None:
+        return
+    try:
+        await redis_client.setex(key, CACHE_TTL_SECONDS, value)
+    except RedisError as e:
+        logger.warning("Cache write failed for %s: %s", key, e)
+
+
+async def cache_delete(key: str):
+    if redis_client is None:
+        return
+    try:
+        await redis_client.delete(key)
+    except RedisError as e:
+        logger.warning("Cache invalidation failed for %s: %s", key, e)
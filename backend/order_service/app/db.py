@@ -1,10 +1,10 @@
 # week05/backend/order_service/app/db.py
 
 import os
+from uuid import uuid4
 
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 
 POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
 POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
@@ -13,18 +13,35 @@ POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
 POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
 
 DATABASE_URL = (
-    f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@"
+    f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@"
     f"{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 )
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
-
+# Each pooled connection keeps up to STATEMENT_CACHE_SIZE prepared statements so
+# repeated queries skip PostgreSQL's parse/plan step. Behind PgBouncer in
+# transaction-pooling mode (usually port 6432) server connections are shared,
+# so both caches must be disabled and prepared statements need unique names
+# (asyncpg's sequential __asyncpg_stmt_N__ names collide across clients).
+USE_PGBOUNCER = os.getenv("USE_PGBOUNCER", "false").lower() == "true"
+STATEMENT_CACHE_SIZE = 0 if USE_PGBOUNCER else int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+CONNECT_ARGS = {
+    "statement_cache_size": STATEMENT_CACHE_SIZE,
+    "prepared_statement_cache_size": STATEMENT_CACHE_SIZE,
+}
+if USE_PGBOUNCER:
+    CONNECT_ARGS["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+engine = create_async_engine(
+    DATABASE_URL,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    query_cache_size=1000,
+    connect_args=CONNECT_ARGS,
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+Base = declarative_base()
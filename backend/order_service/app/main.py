@@ -1,77 +1,211 @@
+import asyncio
 import logging
 import os
 import sys
-import time
-from typing import List
+from collections import defaultdict
+from typing import Dict, List
 
-from fastapi import Depends, FastAPI, HTTPException, status, Response
+from fastapi import FastAPI, HTTPException, status, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.exc import OperationalError
-from sqlalchemy.orm import Session
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam, delete, insert, select, text
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from .db import Base, engine, get_db
-from .models import Order
-from .schemas import OrderCreate, OrderResponse
+from .cache import cache_delete, cache_get, cache_set
+from .db import AsyncSessionLocal, engine
+from .logging_config import configure_logging
+from .models import Order, OrderItem
+from .schemas import CustomerOrdersRequest, OrderCreate, OrderResponse
 
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Order Service API", version="1.0.0")
+# Built once at import; list endpoints validate a page with it, then return dump_json() bytes as-is.
+ORDER_LIST_ADAPTER = TypeAdapter(List[OrderResponse])
+ORDERS_BY_CUSTOMER_ADAPTER = TypeAdapter(Dict[int, List[OrderResponse]])
+
+# Built once so every lookup reuses the same compiled SQL and prepared statement.
+GET_ORDER_STMT = (
+    select(Order)
+    .options(selectinload(Order.items))
+    .where(Order.order_id == bindparam("order_id"))
+)
+
+# Upper bound on orders accepted by a single bulk-create request.
+MAX_BULK_ITEMS = 1000
+
+app = FastAPI(
+    title="Order Service API",
+    version="1.0.0",
+)
+
+# Browsers reject a wildcard origin on credentialed requests, so origins are listed explicitly.
+ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
+    if origin.strip()
+]
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
+# Compress larger payloads (mainly list responses); level 5 trades a little ratio for CPU.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "ok", "service": "order-service"}
 
+# DISABLE_DB (the image default) skips the DB check; k8s sets it to "false".
+DB_CHECK_DISABLED = os.getenv("DISABLE_DB", "false").lower() == "true"
+READY_TIMEOUT_SECONDS = float(os.getenv("READY_TIMEOUT_SECONDS", "2"))
+
+@app.get("/ready")
+async def readiness_check():
+    # Live SELECT 1 on every probe, so the pod drops out of rotation whenever the DB is unreachable.
+    if not DB_CHECK_DISABLED:
+        try:
+            async with asyncio.timeout(READY_TIMEOUT_SECONDS):
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.warning("Order Service: readiness DB check failed: %r", e)
+            return JSONResponse(
+                {"status": "unavailable", "service": "order-service"},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+    return {"status": "ready", "service": "order-service"}
+
 @app.on_event("startup")
 async def startup_event():
-    if os.getenv("DISABLE_DB", "false").lower() == "true":
-        logger.warning("Order Service: Skipping DB initialization (DISABLE_DB=true).")
-        return
-    for i in range(10):
-        try:
-            Base.metadata.create_all(bind=engine)
-            logger.info("Order Service: DB initialized successfully.")
-            break
-        except OperationalError as e:
-            logger.warning(f"Order Service DB failed: {e}")
-            time.sleep(5)
+    if DB_CHECK_DISABLED:
+        logger.warning("Order Service: Skipping DB readiness check (DISABLE_DB=true).")
 
 @app.get("/")
-def root():
+async def root():
     return {"message": "Welcome to the Order Service!"}
 
 @app.post("/orders/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
-def create_order(order: OrderCreate, db: Session = Depends(get_db)):
-    db_order = Order(**order.model_dump())
-    db.add(db_order)
-    db.commit()
-    db.refresh(db_order)
-    return db_order
+async def create_order(order: OrderCreate):
+    items = [
+        {**item.model_dump(), "item_total": item.quantity * item.price_at_purchase}
+        for item in order.items
+    ]
+    order_stmt = (
+        insert(Order)
+        .values(
+            **order.model_dump(exclude={"items"}),
+            total_amount=sum(item["item_total"] for item in items),
+        )
+        .returning(Order)
+    )
+    items_stmt = insert(OrderItem).returning(OrderItem, sort_by_parameter_order=True)
+    async with AsyncSessionLocal() as db:
+        db_order = (await db.execute(order_stmt)).scalar_one()
+        db_items = (
+            await db.execute(items_stmt, [{**item, "order_id": db_order.order_id} for item in items])
+        ).scalars().all()
+        await db.commit()
+    # Attach the RETURNING rows as the loaded collection; AsyncSession cannot lazy-load it.
+    set_committed_value(db_order, "items", list(db_items))
+    return OrderResponse.model_validate(db_order)
+
+@app.post("/orders/bulk", response_model=List[int], status_code=status.HTTP_201_CREATED)
+async def create_orders_bulk(orders: List[OrderCreate]):
+    if len(orders) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ITEMS} orders per request")
+    db_orders = []
+    for order in orders:
+        items = [
+            OrderItem(**item.model_dump(), item_total=item.quantity * item.price_at_purchase)
+            for item in order.items
+        ]
+        db_orders.append(
+            Order(
+                **order.model_dump(exclude={"items"}),
+                total_amount=sum(item.item_total for item in items),
+                items=items,
+            )
+        )
+    # The unit of work batches these into one multi-row INSERT per table.
+    async with AsyncSessionLocal() as db:
+        db.add_all(db_orders)
+        await db.commit()
+    return [db_order.order_id for db_order in db_orders]
 
-@app.get("/orders/", response_model=List[OrderResponse])
-def list_orders(db: Session = Depends(get_db)):
-    return db.query(Order).all()
+@app.get("/orders/", response_model=None, responses={200: {"model": List[OrderResponse]}})
+async def list_orders(skip: int = 0, limit: int = 100):
+    # selectinload fetches every page's items in one extra IN (...) query instead of one per order.
+    stmt = (
+        select(Order)
+        .options(selectinload(Order.items))
+        .order_by(Order.order_id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(stmt)
+        rows = result.scalars().all()
+    orders = ORDER_LIST_ADAPTER.validate_python(rows, from_attributes=True)
+    return Response(ORDER_LIST_ADAPTER.dump_json(orders), media_type="application/json")
+
+@app.post(
+    "/orders/by-customers",
+    response_model=None,
+    responses={200: {"model": Dict[int, List[OrderResponse]]}},
+)
+async def orders_by_customers(request: CustomerOrdersRequest):
+    # One IN (...) query for many customers instead of a GET /orders/ per customer.
+    customer_ids = list(dict.fromkeys(request.customer_ids))
+    stmt = (
+        select(Order)
+        .options(selectinload(Order.items))
+        .where(Order.user_id.in_(customer_ids))
+        .order_by(Order.order_id.desc())
+    )
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(stmt)
+        rows = result.scalars().all()
+    orders_by_customer = defaultdict(list)
+    for order in rows:
+        orders_by_customer[order.user_id].append(order)
+    payload = ORDERS_BY_CUSTOMER_ADAPTER.validate_python(
+        {customer_id: orders_by_customer[customer_id] for customer_id in customer_ids},
+        from_attributes=True,
+    )
+    return Response(ORDERS_BY_CUSTOMER_ADAPTER.dump_json(payload), media_type="application/json")
 
 @app.get("/orders/{order_id}", response_model=OrderResponse)
-def get_order(order_id: int, db: Session = Depends(get_db)):
-    order = db.query(Order).filter(Order.order_id == order_id).first()
+async def get_order(order_id: int):
+    cache_key = f"order:{order_id}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return Response(cached, media_type="application/json")
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(GET_ORDER_STMT, {"order_id": order_id})
+        order = result.scalar_one_or_none()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    return order
+    payload = OrderResponse.model_validate(order).model_dump_json()
+    await cache_set(cache_key, payload)
+    return Response(payload, media_type="application/json")
 
 @app.delete("/orders/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_order(order_id: int, db: Session = Depends(get_db)):
-    order = db.query(Order).filter(Order.order_id == order_id).first()
-    if not order:
+async def delete_order(order_id: int):
+    # The items cascade lives on the ORM relationship only, so remove them explicitly.
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(OrderItem).where(OrderItem.order_id == order_id))
+        result = await db.execute(delete(Order).where(Order.order_id == order_id))
+        await db.commit()
+    await cache_delete(f"order:{order_id}")
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Order not found")
-    db.delete(order)
-    db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -71,6 +71,15 @@ class OrderResponse(OrderBase):
     model_config = ConfigDict(from_attributes=True)  # Enable ORM mode for Pydantic V2
 
 
+class CustomerOrdersRequest(BaseModel):
+    customer_ids: List[int] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="IDs of the customers (order user_id) whose orders to fetch in one call.",
+    )
+
+
 class OrderStatusUpdate(BaseModel):
     status: str = Field(
         ...,
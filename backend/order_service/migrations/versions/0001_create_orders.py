@@ -0,0 +1,84 @@
+"""create orders and order items tables
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases initialised by the old create_all startup already have these tables;
+    # skip them so 'alembic upgrade head' also works there.
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("orders_week05"):
+        op.create_table(
+            "orders_week05",
+            sa.Column("order_id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column(
+                "order_date",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+            sa.Column("status", sa.String(length=50), nullable=False),
+            sa.Column("total_amount", sa.Numeric(precision=10, scale=2), nullable=False),
+            sa.Column("shipping_address", sa.Text(), nullable=True),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=True,
+            ),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("order_id"),
+        )
+        op.create_index("ix_orders_week05_order_id", "orders_week05", ["order_id"])
+        op.create_index("ix_orders_week05_user_id", "orders_week05", ["user_id"])
+
+    if not inspector.has_table("order_items_week05"):
+        op.create_table(
+            "order_items_week05",
+            sa.Column("order_item_id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("order_id", sa.Integer(), nullable=False),
+            sa.Column("product_id", sa.Integer(), nullable=False),
+            sa.Column("quantity", sa.Integer(), nullable=False),
+            sa.Column("price_at_purchase", sa.Numeric(precision=10, scale=2), nullable=False),
+            sa.Column("item_total", sa.Numeric(precision=10, scale=2), nullable=False),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=True,
+            ),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["order_id"], ["orders_week05.order_id"]),
+            sa.PrimaryKeyConstraint("order_item_id"),
+        )
+        op.create_index("ix_order_items_week05_order_item_id", "order_items_week05", ["order_item_id"])
+        op.create_index("ix_order_items_week05_order_id", "order_items_week05", ["order_id"])
+        op.create_index("ix_order_items_week05_product_id", "order_items_week05", ["product_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_order_items_week05_product_id", table_name="order_items_week05")
+    op.drop_index("ix_order_items_week05_order_id", table_name="order_items_week05")
+    op.drop_index("ix_order_items_week05_order_item_id", table_name="order_items_week05")
+    op.drop_table("order_items_week05")
+    op.drop_index("ix_orders_week05_user_id", table_name="orders_week05")
+    op.drop_index("ix_orders_week05_order_id", table_name="orders_week05")
+    op.drop_table("orders_week05")
@@ -1,4 +1,7 @@
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+
 from app.main import app
 
 def test_health():
@@ -6,3 +9,18 @@ def test_health():
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json().get("status") == "ok"
+
+def test_ready_runs_a_live_db_check(monkeypatch):
+    c = TestClient(app)
+    monkeypatch.setattr("app.main.engine", create_async_engine("sqlite+aiosqlite://"))
+    r = c.get("/ready")
+    assert r.status_code == 200
+    assert r.json().get("status") == "ready"
+
+    class StartingUpEngine:
+        # asyncpg's CannotConnectNowError while Postgres boots surfaces as a plain DBAPIError.
+        def connect(self):
+            raise DBAPIError("SELECT 1", None, Exception("the database system is starting up"))
+
+    monkeypatch.setattr("app.main.engine", StartingUpEngine())
+    assert c.get("/ready").status_code == 503
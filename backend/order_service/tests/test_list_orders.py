@@ -0,0 +1,30 @@
+from sqlalchemy import event
+
+
+def test_list_orders_does_not_issue_n_plus_one_queries(sqlite_client):
+    c, engine = sqlite_client
+    orders = [
+        {
+            "user_id": user_id,
+            "items": [
+                {"product_id": 1, "quantity": 1, "price_at_purchase": 2.5},
+                {"product_id": 2, "quantity": 3, "price_at_purchase": 1.0},
+            ],
+        }
+        for user_id in range(1, 11)
+    ]
+    assert c.post("/orders/bulk", json=orders).status_code == 201
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    r = c.get("/orders/")
+    event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert r.status_code == 200
+    assert len(r.json()) == 10
+    assert all(len(order["items"]) == 2 for order in r.json())
+    assert len(statements) <= 3
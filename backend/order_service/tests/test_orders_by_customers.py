@@ -0,0 +1,44 @@
+from sqlalchemy import event
+
+
+def test_orders_by_customers_groups_orders_in_one_batched_query(sqlite_client):
+    c, engine = sqlite_client
+    # Customers 1 and 2 interleaved, so grouping and per-customer ordering are both exercised.
+    orders = [
+        {
+            "user_id": user_id,
+            "items": [{"product_id": 1, "quantity": 1, "price_at_purchase": 2.5}],
+        }
+        for user_id in (1, 2, 1, 3, 2, 1)
+    ]
+    order_ids = c.post("/orders/bulk", json=orders).json()
+    assert len(order_ids) == 6
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    r = c.post("/orders/by-customers", json={"customer_ids": [2, 1, 2, 99]})
+    event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert r.status_code == 200
+    body = r.json()
+    # Duplicate ids collapse; unknown ids still get an (empty) entry.
+    assert list(body) == ["2", "1", "99"]
+    assert body["99"] == []
+    expected = {
+        user_id: sorted(
+            (order_id for order_id, order in zip(order_ids, orders) if order["user_id"] == user_id),
+            reverse=True,
+        )
+        for user_id in (1, 2)
+    }
+    for user_id, ids in expected.items():
+        customer_orders = body[str(user_id)]
+        assert [order["order_id"] for order in customer_orders] == ids
+        assert all(order["user_id"] == user_id for order in customer_orders)
+        assert all(len(order["items"]) == 1 for order in customer_orders)
+    # One query for the orders plus one selectinload query for their items.
+    assert len(statements) <= 2
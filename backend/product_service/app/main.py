@@ -1,104 +1,189 @@
+import asyncio
 import logging
 import os
 import sys
-import time
 from typing import List, Optional
 
-from fastapi import Depends, FastAPI, HTTPException, Query, Response, status
+from fastapi import FastAPI, HTTPException, Query, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.exc import IntegrityError, OperationalError
-from sqlalchemy.orm import Session
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam, delete, insert, select, text, update
+from sqlalchemy.exc import IntegrityError
 
-from .db import Base, engine, get_db
+from .cache import cache_delete, cache_get, cache_set
+from .db import AsyncSessionLocal, engine
+from .logging_config import configure_logging
 from .models import Product
 from .schemas import ProductCreate, ProductResponse, ProductUpdate
 
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Product Service API", version="1.0.0")
+# Columns served by the read endpoints; selecting them directly skips ORM hydration.
+PRODUCT_COLUMNS = (
+    Product.product_id,
+    Product.name,
+    Product.description,
+    Product.price,
+    Product.stock_quantity,
+    Product.image_url,
+    Product.created_at,
+    Product.updated_at,
+)
+
+# Built once so every lookup reuses the same compiled SQL and prepared statement.
+GET_PRODUCT_STMT = select(*PRODUCT_COLUMNS).where(Product.product_id == bindparam("product_id"))
+
+# Built once at import; list endpoints validate a page with it, then return dump_json() bytes as-is.
+PRODUCT_LIST_ADAPTER = TypeAdapter(List[ProductResponse])
+
+# Upper bound on rows accepted by a single bulk-create request.
+MAX_BULK_ITEMS = 1000
+
+app = FastAPI(
+    title="Product Service API",
+    version="1.0.0",
+)
+
+# Browsers reject a wildcard origin on credentialed requests, so origins are listed explicitly.
+ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
+    if origin.strip()
+]
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
+# Compress larger payloads (mainly list responses); level 5 trades a little ratio for CPU.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "ok", "service": "product-service"}
 
+# DISABLE_DB (the image default) skips the DB check; k8s sets it to "false".
+DB_CHECK_DISABLED = os.getenv("DISABLE_DB", "false").lower() == "true"
+READY_TIMEOUT_SECONDS = float(os.getenv("READY_TIMEOUT_SECONDS", "2"))
+
+@app.get("/ready")
+async def readiness_check():
+    # Live SELECT 1 on every probe, so the pod drops out of rotation whenever the DB is unreachable.
+    if not DB_CHECK_DISABLED:
+        try:
+            async with asyncio.timeout(READY_TIMEOUT_SECONDS):
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.warning("Product Service: readiness DB check failed: %r", e)
+            return JSONResponse(
+                {"status": "unavailable", "service": "product-service"},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+    return {"status": "ready", "service": "product-service"}
+
 @app.on_event("startup")
 async def startup_event():
-    if os.getenv("DISABLE_DB", "false").lower() == "true":
-        logger.warning("Product Service: Skipping DB initialization (DISABLE_DB=true).")
-        return
-    for i in range(10):
-        try:
-            Base.metadata.create_all(bind=engine)
-            logger.info("Product Service: DB initialized successfully.")
-            break
-        except OperationalError as e:
-            logger.warning(f"Product Service DB failed: {e}")
-            time.sleep(5)
+    if DB_CHECK_DISABLED:
+        logger.warning("Product Service: Skipping DB readiness check (DISABLE_DB=true).")
 
 @app.get("/")
-def root():
+async def root():
     return {"message": "Welcome to the Product Service!"}
 
 @app.post("/products/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
-def create_product(product: ProductCreate, db: Session = Depends(get_db)):
-    db_product = Product(**product.model_dump())
-    try:
-        db.add(db_product)
-        db.commit()
-        db.refresh(db_product)
-        return db_product
-    except IntegrityError:
-        db.rollback()
-        raise HTTPException(status_code=400, detail="Product already exists")
-    except Exception:
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Could not create product")
-
-@app.get("/products/", response_model=List[ProductResponse])
-def list_products(db: Session = Depends(get_db), skip: int = 0, limit: int = 100):
-    return db.query(Product).offset(skip).limit(limit).all()
+async def create_product(product: ProductCreate):
+    stmt = insert(Product).values(**product.model_dump()).returning(Product)
+    async with AsyncSessionLocal() as db:
+        try:
+            db_product = (await db.execute(stmt)).scalar_one()
+            await db.commit()
+            return ProductResponse.model_validate(db_product)
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail="Product already exists")
+        except Exception:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail="Could not create product")
+
+@app.post("/products/bulk", response_model=List[int], status_code=status.HTTP_201_CREATED)
+async def create_products_bulk(products: List[ProductCreate]):
+    if len(products) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ITEMS} products per request")
+    if not products:
+        return []
+    stmt = insert(Product).returning(Product.product_id, sort_by_parameter_order=True)
+    rows = [product.model_dump() for product in products]
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await db.execute(stmt, rows)
+            product_ids = result.scalars().all()
+            await db.commit()
+            return product_ids
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail="Product already exists")
+        except Exception:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail="Could not create products")
+
+@app.get("/products/", response_model=None, responses={200: {"model": List[ProductResponse]}})
+async def list_products(skip: int = 0, limit: int = 100):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(*PRODUCT_COLUMNS).offset(skip).limit(limit))
+        rows = result.mappings().all()
+    products = PRODUCT_LIST_ADAPTER.validate_python(rows)
+    return Response(PRODUCT_LIST_ADAPTER.dump_json(products), media_type="application/json")
 
 @app.get("/products/{product_id}", response_model=ProductResponse)
-def get_product(product_id: int, db: Session = Depends(get_db)):
-    product = db.query(Product).filter(Product.product_id == product_id).first()
+async def get_product(product_id: int):
+    cache_key = f"product:{product_id}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return Response(cached, media_type="application/json")
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(GET_PRODUCT_STMT, {"product_id": product_id})
+        product = result.mappings().first()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    payload = ProductResponse.model_validate(product).model_dump_json()
+    await cache_set(cache_key, payload)
+    return Response(payload, media_type="application/json")
 
 @app.put("/products/{product_id}", response_model=ProductResponse)
-def update_product(product_id: int, product_data: ProductUpdate, db: Session = Depends(get_db)):
-    product = db.query(Product).filter(Product.product_id == product_id).first()
-    if not product:
+async def update_product(product_id: int, product_data: ProductUpdate):
+    stmt = (
+        update(Product)
+        .where(Product.product_id == product_id)
+        .values(**product_data.model_dump(exclude_unset=True))
+        .returning(Product)
+    )
+    async with AsyncSessionLocal() as db:
+        try:
+            product = (await db.execute(stmt)).scalar_one_or_none()
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail="Could not update product")
+        response = ProductResponse.model_validate(product) if product else None
+    await cache_delete(f"product:{product_id}")
+    if response is None:
         raise HTTPException(status_code=404, detail="Product not found")
-    update_data = product_data.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(product, key, value)
-    try:
-        db.commit()
-        db.refresh(product)
-        return product
-    except Exception:
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Could not update product")
+    return response
 
 @app.delete("/products/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_product(product_id: int, db: Session = Depends(get_db)):
-    product = db.query(Product).filter(Product.product_id == product_id).first()
-    if not product:
+async def delete_product(product_id: int):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(delete(Product).where(Product.product_id == product_id))
+        await db.commit()
+    await cache_delete(f"product:{product_id}")
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Product not found")
-    try:
-        db.delete(product)
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Could not delete product")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,52 @@
+"""create products table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases initialised by the old create_all startup already have these tables;
+    # skip them so 'alembic upgrade head' also works there.
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("products_week05"):
+        op.create_table(
+            "products_week05",
+            sa.Column("product_id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("name", sa.String(length=255), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("price", sa.Numeric(precision=10, scale=2), nullable=False),
+            sa.Column("stock_quantity", sa.Integer(), nullable=False),
+            sa.Column("image_url", sa.String(length=2048), nullable=True),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=True,
+            ),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("product_id"),
+        )
+        op.create_index("ix_products_week05_product_id", "products_week05", ["product_id"])
+        op.create_index("ix_products_week05_name", "products_week05", ["name"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_products_week05_name", table_name="products_week05")
+    op.drop_index("ix_products_week05_product_id", table_name="products_week05")
+    op.drop_table("products_week05")